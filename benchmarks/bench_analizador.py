@@ -0,0 +1,111 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.analizador import analizar_registros  # noqa: E402
+from scripts import sondas_linux, sondas_macos  # noqa: E402
+
+DATOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "datos")
+
+# Tamaño aproximado de las salidas sintéticas, en bytes
+TAMANO = 16 * 1024 * 1024
+
+REPETICIONES = 5
+
+
+# Bucle de OS_HW.py anterior al motor de sondas para 'dmidecode -t memory'.
+def ram_linux_anterior(output):
+    memory_info = []
+    module = {}
+    for line in output.splitlines():
+        if "Size" in line:
+            module["Capacidad (GB)"] = line.split(":")[1].strip()
+        elif "Speed" in line:
+            module["Velocidad (MHz)"] = line.split(":")[1].strip()
+        elif "Manufacturer" in line:
+            module["Fabricante"] = line.split(":")[1].strip()
+        if len(module) == 3:
+            memory_info.append(module)
+            module = {}
+    return memory_info
+
+
+# Bucle de OS_HW.py anterior al motor de sondas para 'diskutil info -all'.
+def almacenamiento_macos_anterior(output):
+    storage_info = []
+    storage = {}
+    for line in output.splitlines():
+        if "Device Identifier:" in line:
+            if storage:
+                storage_info.append(storage)
+                storage = {}
+            storage["Nombre"] = line.split(":")[1].strip()
+        elif "Total Size:" in line:
+            storage["Capacidad"] = line.split(":")[1].split("(")[0].strip()
+        elif "Device / Media Name:" in line:
+            storage["Modelo"] = line.split(":")[1].strip()
+        elif "File System Personality:" in line:
+            storage["Tipo"] = line.split(":")[1].strip()
+    if storage:
+        storage_info.append(storage)
+    return storage_info
+
+
+# Repite una muestra real hasta alcanzar el tamaño indicado. La cabecera de
+# dmidecode (antes del primer "Handle") solo aparece una vez.
+def salida_sintetica(archivo, tamano):
+    with open(os.path.join(DATOS, archivo), "r", encoding="utf-8") as muestra:
+        texto = muestra.read()
+    indice = texto.find("Handle ")
+    cabecera, cuerpo = (texto[:indice], texto[indice:]) if indice > 0 else ("", texto)
+    return cabecera + cuerpo * max(1, tamano // len(cuerpo))
+
+
+# Mejor tiempo de varias ejecuciones de una función.
+def medir(funcion, *args):
+    mejor = None
+    for _ in range(REPETICIONES):
+        inicio = time.perf_counter()
+        funcion(*args)
+        duracion = time.perf_counter() - inicio
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    return mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara el motor de sondas con los bucles anteriores."
+    )
+    parser.add_argument("--tamano", type=int, default=TAMANO, help="Bytes por salida")
+    args = parser.parse_args()
+
+    casos = [
+        (
+            "dmidecode -t memory",
+            "dmidecode-memoria.txt",
+            ram_linux_anterior,
+            sondas_linux.SONDA_RAM,
+        ),
+        (
+            "diskutil info -all",
+            "diskutil-info.txt",
+            almacenamiento_macos_anterior,
+            sondas_macos.SONDA_ALMACENAMIENTO,
+        ),
+    ]
+    for nombre, archivo, anterior, sonda in casos:
+        salida = salida_sintetica(archivo, args.tamano)
+        t_anterior = medir(anterior, salida)
+        t_motor = medir(analizar_registros, sonda, salida)
+        print(
+            f"{nombre} ({len(salida) / 1024**2:.1f} MB): bucle anterior "
+            f"{t_anterior:.3f} s, motor {t_motor:.3f} s "
+            f"({t_anterior / t_motor:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,39 +1,58 @@
-import sys
-import platform
+import argparse
 import json
 import os
-import subprocess
-import re
 from datetime import datetime
+from importlib import import_module
 
+from scripts.archivo import compactar_en_segundo_plano
 
-from scripts.aplicaciones import main as aplicaciones_main
-from scripts.OS_HW import main as os_hw_main
+# Recolectores disponibles: nombre -> (módulo, archivo JSON que genera).
+# Cada módulo se importa solo cuando se ejecuta, de modo que una ejecución con
+# --only no carga el resto de recolectores ni sus dependencias.
+RECOLECTORES = {
+    "os_hw": ("scripts.OS_HW", "OS_HW.json"),
+    "red": ("scripts.red", "Red-scan.json"),
+    "aplicaciones": ("scripts.aplicaciones", "aplicaciones.json"),
+}
 
-from scripts.red import main as red_main
 
-
-def main():
+def main(solo=None):
     # Crear la carpeta con la fecha actual dentro de 'Archivos-JSON'
     json_folder = f"Archivos-JSON/{datetime.now().strftime('%Y-%m-%d')}"
     if not os.path.exists(json_folder):
         os.makedirs(json_folder)
 
+    # Compactar y rotar los días anteriores mientras se recoge la información.
+    # Las ejecuciones cortas con --only no compactan para no retrasar su salida.
+    compactacion = None if solo else compactar_en_segundo_plano(os.getcwd())
+
     # Ejecutar cada script y guardar sus resultados en la carpeta correspondiente
     # Cada script parcial deberá guardar su JSON dentro de 'json_folder'
-    os_hw_main()
-    red_main()
-    aplicaciones_main()
+    for nombre in solo or RECOLECTORES:
+        modulo, _ = RECOLECTORES[nombre]
+        import_module(modulo).main()
+
+    # Crear la carpeta con la fecha actual para el archivo consolidado
+    info_folder = datetime.now().strftime("%Y-%m-%d")
+    informacion_sistema = os.path.join(info_folder, "informacion_sistema.json")
 
-    # Consolidar todos los archivos JSON en un solo archivo
+    # Consolidar todos los archivos JSON en un solo archivo. Una ejecución con
+    # --only solo actualiza sus claves en el consolidado del día, y no lo crea si
+    # aún no existe: una instantánea parcial se tomaría como la más reciente del
+    # host al agregar la flota
     data = {}
+    if solo:
+        if not os.path.exists(informacion_sistema):
+            print(
+                f"'{informacion_sistema}' no existe todavía; se consolidará en la "
+                "próxima ejecución completa."
+            )
+            return
+        with open(informacion_sistema, "r", encoding="utf-8") as file:
+            data = json.load(file)
 
     # Leer cada archivo JSON parcial desde la carpeta con la fecha
-    json_files = [
-        "OS_HW.json",
-        "Red-scan.json",
-        "aplicaciones.json",
-    ]
+    json_files = [RECOLECTORES[nombre][1] for nombre in solo or RECOLECTORES]
     for json_file in json_files:
         file_path = os.path.join(json_folder, json_file)
         if not os.path.exists(file_path):
@@ -48,16 +67,37 @@ def main():
             ].lower()  # Nombre de la clave en el JSON consolidado
             data[key] = json.load(file)
 
-    # Crear la carpeta con la fecha actual y guardar el archivo consolidado dentro
-    info_folder = datetime.now().strftime("%Y-%m-%d")
+    # Guardar el archivo consolidado dentro de la carpeta con la fecha
     if not os.path.exists(info_folder):
         os.makedirs(info_folder)
 
-    informacion_sistema = os.path.join(info_folder, "informacion_sistema.json")
     with open(informacion_sistema, "w", encoding="utf-8") as file:
         json.dump(data, file, indent=4, ensure_ascii=False)
     print(f"Archivo creado '{informacion_sistema}' generado exitosamente.")
 
+    if compactacion:
+        compactacion.join()
+
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(
+        description="Recopila la información del sistema y la consolida en un JSON."
+    )
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        choices=list(RECOLECTORES),
+        help="Ejecuta solo los recolectores indicados",
+    )
+    parser.add_argument(
+        "--verificar-arranque",
+        action="store_true",
+        help="Comprueba el presupuesto de tiempo de importación y termina",
+    )
+    args = parser.parse_args()
+
+    if args.verificar_arranque:
+        from scripts.arranque import verificar_presupuesto
+
+        raise SystemExit(0 if verificar_presupuesto() else 1)
+    main(args.only)
@@ -1,10 +1,19 @@
-import platform
 import json
 import os
 import subprocess
-import re
 from datetime import datetime
 
+from scripts.analizador import analizar_registro, analizar_registros
+from scripts.plataforma import SISTEMA
+
+# Solo se cargan (y compilan) las sondas del sistema operativo actual
+if SISTEMA == "Windows":
+    from scripts import sondas_windows as sondas
+elif SISTEMA == "Darwin":
+    from scripts import sondas_macos as sondas
+else:
+    from scripts import sondas_linux as sondas
+
 
 def execute_command(command, description=""):
     # Ejecuta un comando en la terminal y maneja posibles errores.
@@ -37,14 +46,17 @@ def command_exists(command):
 
 def get_system_info():
     # Recopila información básica del sistema operativo.
-    if platform.system() == "Darwin":
+    # platform solo se necesita aquí; el resto del módulo usa SISTEMA
+    import platform
+
+    if SISTEMA == "Darwin":
         if not command_exists("sw_vers"):
             return {"Error": "Comando sw_vers no disponible en macOS"}
         cmd = "sw_vers"
         output = execute_command(cmd, description="información del sistema en macOS")
         return {"Nombre del Sistema Operativo": "macOS", "Detalles": output}
     return {
-        "Nombre del Sistema Operativo": platform.system(),
+        "Nombre del Sistema Operativo": SISTEMA,
         "Versión del Sistema Operativo": platform.version(),
         "Arquitectura": platform.architecture()[0],
     }
@@ -54,30 +66,24 @@ def get_cpu_info():
     # Recopila información detallada del procesador (CPU) para macOS, Windows y Linux.
     cpu_info = {}
 
-    if platform.system() == "Darwin":
+    if SISTEMA == "Darwin":
         if not command_exists("sysctl"):
             return {"Error": "Comando sysctl no disponible en macOS"}
         cmd = "sysctl -n machdep.cpu.brand_string"
         output = execute_command(cmd, description="información de la CPU en macOS")
         cpu_info["Modelo de CPU"] = output
 
-    elif platform.system() == "Windows":
+    elif SISTEMA == "Windows":
         cmd = "wmic cpu get Name,NumberOfCores,NumberOfLogicalProcessors,MaxClockSpeed /format:list"
         output = execute_command(cmd, description="información de la CPU en Windows")
-        for line in output.splitlines():
-            if "=" in line:
-                key, value = line.split("=", 1)
-                cpu_info[key.strip()] = value.strip()
+        cpu_info = analizar_registro(sondas.SONDA_CPU, output)
 
     else:
         if not command_exists("lscpu"):
             return {"Error": "Comando lscpu no disponible"}
-        cmd = "lscpu | grep -E 'Model name|^CPU\(s\)|Thread|MHz'"
+        cmd = "lscpu"
         output = execute_command(cmd, description="información de la CPU en Linux")
-        for line in output.splitlines():
-            if ":" in line:
-                key, value = line.split(":", 1)
-                cpu_info[key.strip()] = value.strip()
+        cpu_info = analizar_registro(sondas.SONDA_CPU, output)
 
     return cpu_info or {"Error": "No se pudo obtener información de la CPU"}
 
@@ -86,74 +92,49 @@ def get_gpu_info():
     # Recopila información detallada de las tarjetas gráficas (GPUs) para macOS, Windows y Linux.
     gpu_info = []
 
-    if platform.system() == "Darwin":
+    if SISTEMA == "Darwin":
         if not command_exists("system_profiler"):
             return [{"Error": "Comando system_profiler no disponible en macOS"}]
         cmd = "system_profiler SPDisplaysDataType"
         output = execute_command(cmd, description="información de la GPU en macOS")
-        gpu = {}
-        for line in output.splitlines():
-            if "Chipset Model:" in line:
-                gpu["Nombre"] = line.split(":")[1].strip()
-            elif "VRAM (Total):" in line or "VRAM (Dynamic, Max):" in line:
-                gpu["Memoria Dedicada (MB)"] = line.split(":")[1].strip()
-            if len(gpu) > 0:
-                gpu_info.append(gpu)
+        gpu_info = analizar_registros(sondas.SONDA_GPU, output)
         return gpu_info or [{"Error": "No se pudo obtener información de la GPU"}]
 
-    elif platform.system() == "Windows":
+    elif SISTEMA == "Windows":
         cmd = "wmic path win32_videocontroller get Name,AdapterRAM,DriverVersion /format:list"
         output = execute_command(cmd, description="listado de GPUs en Windows")
-        gpu = {}
-        for line in output.splitlines():
-            if "=" in line:
-                key, value = line.split("=", 1)
-                key, value = key.strip(), value.strip()
-                if key == "Name":
-                    gpu["Nombre"] = value
-                elif key == "AdapterRAM":
-                    try:
-                        gpu["Memoria Dedicada (MB)"] = round(int(value) / (1024**2), 2)
-                    except ValueError:
-                        gpu["Memoria Dedicada (MB)"] = "No disponible"
-                elif key == "DriverVersion":
-                    gpu["Versión del Controlador"] = value
-                if len(gpu) == 3:
-                    gpu_info.append(gpu)
-                    gpu = {}
-        if gpu:
-            gpu_info.append(gpu)
+        gpu_info = analizar_registros(sondas.SONDA_GPU, output)
 
     else:
         if not command_exists("lspci"):
             return [{"Error": "Comando lspci no disponible"}]
-        cmd_lspci = "lspci | grep -i vga"
+        cmd_lspci = "lspci"
         output_lspci = execute_command(
             cmd_lspci, description="listado de GPUs en Linux"
         )
-        output_nvidia = None
-        if any(
-            "NVIDIA" in line for line in output_lspci.splitlines()
-        ) and command_exists("nvidia-smi"):
+        gpus = analizar_registros(sondas.SONDA_GPU, output_lspci)
+        datos_nvidia = []
+        if any("NVIDIA" in gpu["Nombre"] for gpu in gpus) and command_exists(
+            "nvidia-smi"
+        ):
             cmd_nvidia = "nvidia-smi --query-gpu=driver_version,memory.total --format=csv,noheader"
             output_nvidia = execute_command(
                 cmd_nvidia, description="información de la GPU NVIDIA en Linux"
             )
-            output_nvidia_lines = output_nvidia.splitlines()
-        for index, line in enumerate(output_lspci.splitlines()):
-            gpu = {
-                "Nombre": line.split(":")[-1].strip(),
-                "Memoria Dedicada (MB)": (
-                    output_nvidia_lines[index].split(",")[1].strip()
-                    if output_nvidia and "NVIDIA" in line
-                    else "Desconocida"
-                ),
-                "Versión del Controlador": (
-                    output_nvidia_lines[index].split(",")[0].strip()
-                    if output_nvidia and "NVIDIA" in line
-                    else "Desconocida"
-                ),
-            }
+            datos_nvidia = [
+                linea.split(",") for linea in output_nvidia.splitlines() if "," in linea
+            ]
+        for gpu in gpus:
+            # nvidia-smi solo lista las GPUs NVIDIA, en el mismo orden que lspci
+            datos = (
+                datos_nvidia.pop(0)
+                if datos_nvidia and "NVIDIA" in gpu["Nombre"]
+                else None
+            )
+            gpu["Memoria Dedicada (MB)"] = datos[1].strip() if datos else "Desconocida"
+            gpu["Versión del Controlador"] = (
+                datos[0].strip() if datos else "Desconocida"
+            )
             gpu_info.append(gpu)
 
     return gpu_info or [{"Error": "No se pudo obtener información de las GPUs"}]
@@ -163,34 +144,28 @@ def get_motherboard_info():
     # Recopila información de la placa base para macOS, Windows y Linux.
     motherboard_info = {}
 
-    if platform.system() == "Darwin":
+    if SISTEMA == "Darwin":
         motherboard_info["Error"] = (
             "Información de la placa base no disponible en macOS mediante comandos estándar"
         )
 
-    elif platform.system() == "Windows":
+    elif SISTEMA == "Windows":
         cmd = (
             "wmic baseboard get product,manufacturer,version,serialnumber /format:list"
         )
         output = execute_command(
             cmd, description="información de la placa base en Windows"
         )
-        for line in output.splitlines():
-            if "=" in line:
-                key, value = line.split("=", 1)
-                motherboard_info[key.strip()] = value.strip()
+        motherboard_info = analizar_registro(sondas.SONDA_PLACA, output)
 
     else:
         if not command_exists("dmidecode"):
             return {"Error": "Comando dmidecode no disponible"}
-        cmd = "sudo dmidecode -t baseboard | grep -E 'Manufacturer|Product Name|Version|Serial Number'"
+        cmd = "sudo dmidecode -t baseboard"
         output = execute_command(
             cmd, description="información de la placa base en Linux"
         )
-        for line in output.splitlines():
-            if ":" in line:
-                key, value = line.split(":", 1)
-                motherboard_info[key.strip()] = value.strip()
+        motherboard_info = analizar_registro(sondas.SONDA_PLACA, output)
 
     return motherboard_info or {
         "Error": "No se pudo obtener información de la placa base"
@@ -201,57 +176,25 @@ def get_memory_info():
     # Recopila información detallada de la memoria RAM para macOS, Windows y Linux.
     memory_info = []
 
-    if platform.system() == "Darwin":
+    if SISTEMA == "Darwin":
         if not command_exists("system_profiler"):
             return [{"Error": "Comando system_profiler no disponible en macOS"}]
         cmd = "system_profiler SPMemoryDataType"
         output = execute_command(cmd, description="información de la RAM en macOS")
-        module = {}
-        for line in output.splitlines():
-            if "Size:" in line:
-                module["Capacidad (GB)"] = line.split(":")[1].strip()
-            elif "Speed:" in line:
-                module["Velocidad (MHz)"] = line.split(":")[1].strip()
-            elif "Manufacturer:" in line:
-                module["Fabricante"] = line.split(":")[1].strip()
-            if len(module) == 3:
-                memory_info.append(module)
-                module = {}
+        memory_info = analizar_registros(sondas.SONDA_RAM, output)
         return memory_info or [{"Error": "No se pudo obtener información de la RAM"}]
 
-    elif platform.system() == "Windows":
+    elif SISTEMA == "Windows":
         cmd = "wmic memorychip get Capacity,Speed,Manufacturer /format:list"
         output = execute_command(cmd, description="información de la RAM en Windows")
-        module = {}
-        for line in output.splitlines():
-            if "=" in line:
-                key, value = line.split("=", 1)
-                if key.strip() == "Capacity":
-                    module["Capacidad (GB)"] = round(int(value.strip()) / (1024**3), 2)
-                elif key.strip() == "Speed":
-                    module["Velocidad (MHz)"] = value.strip()
-                elif key.strip() == "Manufacturer":
-                    module["Fabricante"] = value.strip()
-                if len(module) == 3:
-                    memory_info.append(module)
-                    module = {}
+        memory_info = analizar_registros(sondas.SONDA_RAM, output)
 
     else:
         if not command_exists("dmidecode"):
             return [{"Error": "Comando dmidecode no disponible"}]
-        cmd = "dmidecode -t memory | grep -E 'Size|Speed|Manufacturer'"
+        cmd = "dmidecode -t memory"
         output = execute_command(cmd, description="información de la RAM en Linux")
-        module = {}
-        for line in output.splitlines():
-            if "Size" in line:
-                module["Capacidad (GB)"] = line.split(":")[1].strip()
-            elif "Speed" in line:
-                module["Velocidad (MHz)"] = line.split(":")[1].strip()
-            elif "Manufacturer" in line:
-                module["Fabricante"] = line.split(":")[1].strip()
-            if len(module) == 3:
-                memory_info.append(module)
-                module = {}
+        memory_info = analizar_registros(sondas.SONDA_RAM, output)
 
     return memory_info or [{"Error": "No se pudo obtener información de la RAM"}]
 
@@ -260,73 +203,36 @@ def get_storage_info():
     # Recopila información detallada del almacenamiento para macOS, Windows y Linux.
     storage_info = []
 
-    if platform.system() == "Darwin":
+    if SISTEMA == "Darwin":
         if not command_exists("diskutil"):
             return [{"Error": "Comando diskutil no disponible en macOS"}]
         cmd = "diskutil info -all"
         output = execute_command(
             cmd, description="información de almacenamiento en macOS"
         )
-        storage = {}
-        for line in output.splitlines():
-            if "Device Identifier:" in line:
-                if storage:
-                    storage_info.append(storage)
-                    storage = {}
-                storage["Nombre"] = line.split(":")[1].strip()
-            elif "Total Size:" in line:
-                storage["Capacidad"] = line.split(":")[1].split("(")[0].strip()
-            elif "Device / Media Name:" in line:
-                storage["Modelo"] = line.split(":")[1].strip()
-            elif "File System Personality:" in line:
-                storage["Tipo"] = line.split(":")[1].strip()
-        if storage:
-            storage_info.append(storage)
-
-    elif platform.system() == "Windows":
+        storage_info = analizar_registros(sondas.SONDA_ALMACENAMIENTO, output)
+
+    elif SISTEMA == "Windows":
         cmd = (
             "wmic diskdrive get caption, size, mediaType, firmwareRevision /format:list"
         )
         output = execute_command(
             cmd, description="información de almacenamiento en Windows"
         )
-        disk = {}
-        for line in output.splitlines():
-            if "=" in line:
-                key, value = line.split("=", 1)
-                key, value = key.strip(), value.strip()
-                if key == "Caption":
-                    if disk:
-                        storage_info.append(disk)
-                        disk = {}
-                    disk["Nombre"] = value
-                elif key == "Size":
-                    disk["Capacidad (GB)"] = round(int(value) / (1024**3), 2)
-                elif key == "MediaType":
-                    disk["Tipo"] = value
-                elif key == "FirmwareRevision":
-                    disk["Versión Firmware"] = value
-        if disk:
-            storage_info.append(disk)
+        storage_info = analizar_registros(sondas.SONDA_ALMACENAMIENTO, output)
 
     else:
         if not command_exists("lsblk"):
             return [{"Error": "Comando lsblk no disponible"}]
-        cmd = "lsblk -o NAME,SIZE,TYPE,MODEL | grep disk"
+        cmd = "lsblk -d -P -o NAME,SIZE,TYPE,MODEL"
         output = execute_command(
             cmd, description="información de almacenamiento en Linux"
         )
-        for line in output.splitlines():
-            parts = re.split(r"\s+", line.strip())
-            if len(parts) >= 4:
-                storage_info.append(
-                    {
-                        "Nombre": parts[0],
-                        "Capacidad": parts[1],
-                        "Tipo": parts[2],
-                        "Modelo": " ".join(parts[3:]),
-                    }
-                )
+        storage_info = [
+            disco
+            for disco in analizar_registros(sondas.SONDA_ALMACENAMIENTO, output)
+            if disco.get("Tipo") == "disk"
+        ]
 
     return storage_info or [
         {"Error": "No se pudo obtener información del almacenamiento"}
@@ -0,0 +1,180 @@
+import re
+import sys
+
+# Sangría de las salidas "Etiqueta: valor". Se consume de forma atómica para no
+# reintentar las etiquetas en cada espacio: con un cuantificador posesivo desde
+# Python 3.11 y, en versiones anteriores, con un lookahead y una referencia
+if sys.version_info >= (3, 11):
+    SANGRIA = r"[ \t]*+"
+else:
+    SANGRIA = r"(?=(?P<sangria>[ \t]*))(?P=sangria)"
+
+ESPECIALES = set(".^$*+?{}[]()|\\")
+
+
+# Divide una expresión regular en sus alternativas de primer nivel.
+def _alternativas(patron):
+    partes = []
+    actual = ""
+    nivel = 0
+    clase = False
+    i = 0
+    while i < len(patron):
+        caracter = patron[i]
+        if caracter == "\\":
+            actual += patron[i : i + 2]
+            i += 2
+            continue
+        if clase:
+            clase = caracter != "]"
+        elif caracter == "[":
+            clase = True
+        elif caracter == "(":
+            nivel += 1
+        elif caracter == ")":
+            nivel -= 1
+        elif caracter == "|" and nivel == 0:
+            partes.append(actual)
+            actual = ""
+            i += 1
+            continue
+        actual += caracter
+        i += 1
+    partes.append(actual)
+    return partes
+
+
+# Devuelve el conjunto de caracteres con los que puede empezar una coincidencia
+# de las expresiones indicadas, o None si alguna alternativa no empieza por un
+# carácter literal obligatorio.
+def _iniciales(patrones):
+    iniciales = set()
+    for patron in patrones:
+        for alternativa in _alternativas(patron):
+            if alternativa[:1] == "\\" and alternativa[1:2] in ESPECIALES:
+                caracter, resto = alternativa[1], alternativa[2:]
+            elif alternativa[:1] and alternativa[0] not in ESPECIALES:
+                caracter, resto = alternativa[0], alternativa[1:]
+            else:
+                return None
+            if resto[:1] in ("?", "*", "{"):
+                return None
+            iniciales.add(caracter)
+    return iniciales
+
+
+# Compila la descripción declarativa de una sonda en una única expresión regular.
+# :param campos: Lista de tuplas (clave, etiqueta, conversión). La etiqueta es una
+#                expresión regular; si la clave es None se usa el texto encontrado
+#                como clave. La conversión es una función opcional sobre el valor.
+# :param separador: Carácter que separa la etiqueta del valor (":" o "=").
+# :param inicio: Expresión regular de la línea que abre un registro nuevo (opcional,
+#                solo para el formato "lineas").
+# :param formato: "lineas" para salidas "Etiqueta: valor" o "pares" para ETIQUETA="valor".
+# :return: Diccionario con el patrón combinado y la tabla de campos.
+def compilar_sonda(campos, separador=":", inicio=None, formato="lineas"):
+    sep = re.escape(separador)
+    etiquetas = "|".join(f"(?:{etiqueta})" for _, etiqueta, _ in campos)
+
+    if formato == "pares":
+        patron = rf'(?<![\w-])(?P<etiqueta>{etiquetas}){sep}"(?P<valor>[^"]*)"'
+    else:
+        # Se ancla con un salto de línea literal en lugar de "^[ \t]*" para que el
+        # motor salte de línea en línea, y las etiquetas comparten un solo grupo.
+        # Si se conocen los primeros caracteres de todas las etiquetas, un
+        # lookahead descarta con una sola comprobación las líneas que no interesan
+        primeros = _iniciales(
+            [etiqueta for _, etiqueta, _ in campos]
+            + ([inicio] if inicio is not None else [])
+        )
+        filtro = ""
+        if primeros:
+            filtro = "(?=[" + "".join(re.escape(c) for c in sorted(primeros)) + "])"
+        patron = (
+            rf"\n{SANGRIA}{filtro}"
+            rf"(?:(?P<etiqueta>{etiquetas})[ \t]*{sep}[ \t]*(?P<valor>.*)"
+        )
+        if inicio is not None:
+            patron += rf"|(?P<inicio>{inicio})[ \t]*\r?$"
+        patron += ")"
+
+    return {
+        "patron": re.compile(patron, re.MULTILINE),
+        "campos": [
+            (re.compile(etiqueta), clave, conversion)
+            for clave, etiqueta, conversion in campos
+        ],
+        # Caché de texto de etiqueta -> (clave, conversión)
+        "resueltas": {},
+    }
+
+
+# Busca el campo declarado que corresponde al texto de una etiqueta encontrada.
+def _resolver_etiqueta(sonda, etiqueta):
+    for patron, clave, conversion in sonda["campos"]:
+        if patron.fullmatch(etiqueta):
+            campo = (clave if clave is not None else etiqueta, conversion)
+            sonda["resueltas"][etiqueta] = campo
+            return campo
+
+
+# Recorre la salida de un comando en una sola pasada y la agrupa en registros.
+# Un registro se cierra al encontrar la línea de inicio de la sonda o al repetirse
+# un campo que ya tiene el registro actual. Los registros vacíos se descartan.
+# :param sonda: Sonda creada con compilar_sonda.
+# :param salida: Texto completo devuelto por el comando.
+# :return: Lista de diccionarios, uno por registro.
+def analizar_registros(sonda, salida):
+    registros = []
+    registro = {}
+    resueltas = sonda["resueltas"]
+
+    # El salto de línea inicial permite que la primera línea también coincida
+    for coincidencia in sonda["patron"].finditer("\n" + salida):
+        if coincidencia.lastgroup == "inicio":
+            if registro:
+                registros.append(registro)
+                registro = {}
+            continue
+
+        etiqueta = coincidencia.group("etiqueta")
+        campo = resueltas.get(etiqueta) or _resolver_etiqueta(sonda, etiqueta)
+        clave, conversion = campo
+        if clave in registro:
+            registros.append(registro)
+            registro = {}
+
+        valor = coincidencia.group("valor").rstrip()
+        registro[clave] = conversion(valor) if conversion else valor
+
+    if registro:
+        registros.append(registro)
+    return registros
+
+
+# Analiza la salida como un único registro; los valores repetidos sobrescriben
+# a los anteriores.
+def analizar_registro(sonda, salida):
+    resultado = {}
+    for registro in analizar_registros(sonda, salida):
+        resultado.update(registro)
+    return resultado
+
+
+# Devuelve una conversión de bytes a la unidad indicada ("MB" o "GB"),
+# redondeada a dos decimales.
+def bytes_a(unidad):
+    divisor = {"MB": 1024**2, "GB": 1024**3}[unidad]
+
+    def convertir(valor):
+        try:
+            return round(int(valor) / divisor, 2)
+        except ValueError:
+            return "No disponible"
+
+    return convertir
+
+
+# Conserva solo el texto previo al primer paréntesis, p. ej. "500.3 GB (500277792768 Bytes)".
+def antes_de_parentesis(valor):
+    return valor.split("(")[0].strip()
@@ -1,17 +1,17 @@
-import platform
 import json
 import os
 import subprocess
 import re
 from datetime import datetime
 
-# Importa winreg solo si el sistema operativo es Windows
-if platform.system() == "Windows":
-    import winreg
+from scripts.plataforma import SISTEMA
 
 
 # Obtiene una lista de aplicaciones instaladas en Windows con información detallada.
 def obtener_aplicaciones_windows():
+    # winreg solo existe en Windows; se importa aquí para no cargarlo en otros sistemas
+    import winreg
+
     aplicaciones = []
     rutas = [
         r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall",
@@ -142,7 +142,7 @@ def obtener_aplicaciones_macos():
 
 # Función principal que detecta el sistema operativo y obtiene la lista de aplicaciones instaladas.
 def main():
-    sistema_operativo = platform.system()
+    sistema_operativo = SISTEMA
     print(f"Detectado sistema operativo: {sistema_operativo}")
     aplicaciones = []
 
@@ -0,0 +1,297 @@
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+
+# Carpetas (relativas al directorio de salida) donde los recolectores y el
+# coordinador crean un directorio por día, con los únicos archivos que pueden
+# contener. Un directorio diario con cualquier otro contenido no se toca.
+RAICES = {
+    "Archivos-JSON": {"OS_HW.json", "Red-scan.json", "aplicaciones.json"},
+    "": {"informacion_sistema.json"},
+}
+
+# Los directorios diarios más recientes que este número de días se dejan sin
+# tocar, porque las ejecuciones horarias siguen reescribiéndolos
+DIAS_RECIENTES = 7
+
+# Los días archivados se conservan durante este número de meses
+MESES_RETENCION = 12
+
+# Segundos tras los cuales el bloqueo de un archivo mensual se considera
+# abandonado por una ejecución interrumpida
+BLOQUEO_CADUCADO = 3600
+
+CARPETA_ARCHIVO = "Archivo"
+PATRON_DIA = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+# Lista los directorios diarios (YYYY-MM-DD) que existen en una raíz.
+def listar_dias(raiz):
+    if not os.path.isdir(raiz):
+        return []
+    return sorted(
+        nombre
+        for nombre in os.listdir(raiz)
+        if PATRON_DIA.fullmatch(nombre) and os.path.isdir(os.path.join(raiz, nombre))
+    )
+
+
+# Comprueba que un directorio diario solo contiene salidas conocidas de los
+# recolectores (archivos regulares, sin subcarpetas).
+def es_dia_recolectado(carpeta, permitidos):
+    contenido = os.listdir(carpeta)
+    return bool(contenido) and all(
+        nombre in permitidos and os.path.isfile(os.path.join(carpeta, nombre))
+        for nombre in contenido
+    )
+
+
+# Devuelve la ruta del archivo comprimido mensual que guarda un día.
+def ruta_archivo(raiz, dia):
+    return os.path.join(raiz, CARPETA_ARCHIVO, f"{dia[:7]}.zip")
+
+
+# Calcula el primer mes (YYYY-MM) que todavía debe conservarse.
+def mes_limite(hoy, meses_retencion):
+    total = hoy.year * 12 + (hoy.month - 1) - meses_retencion
+    return f"{total // 12:04d}-{total % 12 + 1:02d}"
+
+
+# Toma el bloqueo de un archivo mensual creando su fichero '.lock' de forma
+# exclusiva, para que dos ejecuciones solapadas no lo reescriban a la vez.
+# :return: Ruta del bloqueo, o None si otra ejecución lo tiene.
+def bloquear(destino):
+    bloqueo = destino + ".lock"
+    try:
+        if time.time() - os.path.getmtime(bloqueo) > BLOQUEO_CADUCADO:
+            os.remove(bloqueo)
+    except OSError:
+        pass
+    try:
+        os.close(os.open(bloqueo, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+    except FileExistsError:
+        return None
+    return bloqueo
+
+
+# Calcula el CRC-32 y el tamaño de un archivo, los mismos datos que guarda el
+# directorio central del ZIP para cada miembro.
+def huella_archivo(ruta):
+    import zlib
+
+    crc = 0
+    with open(ruta, "rb") as archivo:
+        for bloque in iter(lambda: archivo.read(1024 * 1024), b""):
+            crc = zlib.crc32(bloque, crc)
+    return crc, os.path.getsize(ruta)
+
+
+# Empaqueta varios directorios diarios del mismo mes en su archivo mensual.
+# Cada archivo es un ZIP con compresión por fichero: su directorio central sirve
+# de índice y permite leer un día sin descomprimir el resto. El archivo se
+# reescribe en una copia temporal y se sustituye de forma atómica, de modo que
+# una interrupción nunca deja un archivo dañado ni pierde un directorio.
+# :return: True si se archivaron los días; False si otra ejecución tiene el
+#          archivo bloqueado.
+def compactar_mes(raiz, dias):
+    # shutil y zipfile cargan los módulos de compresión; solo se importan cuando
+    # hay algo que archivar para no retrasar el arranque del coordinador
+    import shutil
+    import tempfile
+    import zipfile
+
+    destino = ruta_archivo(raiz, dias[0])
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    bloqueo = bloquear(destino)
+    if bloqueo is None:
+        print(f"'{destino}' está bloqueado por otra ejecución; se omite.")
+        return False
+
+    try:
+        # Otra ejecución pudo archivar alguno de los días antes de este bloqueo
+        dias = [dia for dia in dias if os.path.isdir(os.path.join(raiz, dia))]
+        nuevos = {
+            f"{dia}/{archivo}": os.path.join(raiz, dia, archivo)
+            for dia in dias
+            for archivo in sorted(os.listdir(os.path.join(raiz, dia)))
+        }
+
+        existentes = {}
+        if os.path.exists(destino):
+            with zipfile.ZipFile(destino) as zf:
+                existentes = {
+                    info.filename: (info.CRC, info.file_size) for info in zf.infolist()
+                }
+
+        # Un miembro ya archivado con el mismo contenido (ejecución interrumpida)
+        # no se duplica; si el día se recreó con otro contenido, el archivo se
+        # reescribe sin la versión anterior
+        reemplazados = set()
+        for nombre in list(nuevos):
+            if nombre in existentes:
+                if existentes[nombre] == huella_archivo(nuevos[nombre]):
+                    del nuevos[nombre]
+                else:
+                    reemplazados.add(nombre)
+
+        descriptor, temporal = tempfile.mkstemp(
+            prefix=os.path.basename(destino) + ".",
+            suffix=".tmp",
+            dir=os.path.dirname(destino),
+        )
+        os.close(descriptor)
+        try:
+            if existentes and not reemplazados:
+                shutil.copyfile(destino, temporal)
+                modo = "a"
+            else:
+                modo = "w"
+
+            with zipfile.ZipFile(
+                temporal, modo, compression=zipfile.ZIP_DEFLATED
+            ) as zf:
+                if reemplazados:
+                    with zipfile.ZipFile(destino) as anterior:
+                        for info in anterior.infolist():
+                            if info.filename not in reemplazados:
+                                zf.writestr(info, anterior.read(info))
+                for nombre, ruta in nuevos.items():
+                    zf.write(ruta, nombre)
+
+            os.replace(temporal, destino)
+        except BaseException:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            raise
+
+        for dia in dias:
+            shutil.rmtree(os.path.join(raiz, dia))
+    finally:
+        os.remove(bloqueo)
+
+    print(f"Archivados {len(dias)} días en '{destino}'")
+    return True
+
+
+# Aplica la política de retención a una raíz en pasos incrementales: cada paso
+# compacta los días pendientes de un solo mes o elimina un archivo caducado.
+# Solo se tratan los directorios diarios que contienen exclusivamente archivos
+# de 'permitidos'; el resto se omite y se registra.
+# :param raiz: Carpeta que contiene los directorios diarios.
+# :param permitidos: Nombres de archivo que puede contener un directorio diario.
+# :param dias_recientes: Días que se conservan como directorios sin comprimir.
+# :param meses_retencion: Meses que se conservan los días archivados.
+# :return: Generador que produce una descripción de cada paso realizado.
+def pasos_retencion(
+    raiz, permitidos, dias_recientes=DIAS_RECIENTES, meses_retencion=MESES_RETENCION
+):
+    hoy = datetime.now()
+    corte = (hoy - timedelta(days=dias_recientes)).strftime("%Y-%m-%d")
+    limite = mes_limite(hoy, meses_retencion)
+
+    pendientes = {}
+    for dia in listar_dias(raiz):
+        if dia >= corte:
+            continue
+        if not es_dia_recolectado(os.path.join(raiz, dia), permitidos):
+            print(
+                f"Advertencia: '{os.path.join(raiz, dia)}' contiene archivos que no "
+                "son de los recolectores; se omite de la retención."
+            )
+            continue
+        if dia[:7] < limite:
+            import shutil
+
+            shutil.rmtree(os.path.join(raiz, dia))
+            yield f"eliminado {dia}"
+            continue
+        pendientes.setdefault(dia[:7], []).append(dia)
+
+    for mes, dias in sorted(pendientes.items()):
+        if compactar_mes(raiz, dias):
+            yield f"compactado {mes}"
+
+    carpeta = os.path.join(raiz, CARPETA_ARCHIVO)
+    if os.path.isdir(carpeta):
+        for nombre in sorted(os.listdir(carpeta)):
+            if re.fullmatch(r"\d{4}-\d{2}\.zip", nombre) and nombre[:7] < limite:
+                os.remove(os.path.join(carpeta, nombre))
+                yield f"eliminado {nombre}"
+
+
+# Ejecuta la retención sobre todas las raíces y registra los errores sin detener
+# el resto de pasos.
+# :param salida: Directorio donde el coordinador escribe sus resultados (por
+#                defecto el directorio actual, como los recolectores).
+def aplicar_retencion(
+    salida=None,
+    dias_recientes=DIAS_RECIENTES,
+    meses_retencion=MESES_RETENCION,
+):
+    if salida is None:
+        salida = os.getcwd()
+    for relativa, permitidos in RAICES.items():
+        raiz = os.path.join(salida, relativa) if relativa else salida
+        try:
+            for _ in pasos_retencion(raiz, permitidos, dias_recientes, meses_retencion):
+                pass
+        except OSError as e:
+            print(f"Error aplicando la retención en '{raiz}': {e}")
+
+
+# Lanza la retención en un hilo para que la recolección no espere por ella.
+# :param salida: Directorio donde el coordinador escribe sus resultados (por
+#                defecto el directorio actual, como los recolectores).
+# :return: Hilo iniciado; el llamador puede esperarlo con join().
+def compactar_en_segundo_plano(
+    salida=None,
+    dias_recientes=DIAS_RECIENTES,
+    meses_retencion=MESES_RETENCION,
+):
+    if salida is None:
+        salida = os.getcwd()
+    hilo = threading.Thread(
+        target=aplicar_retencion,
+        args=(salida, dias_recientes, meses_retencion),
+        name="compactacion-archivo",
+    )
+    hilo.start()
+    return hilo
+
+
+# Lee los JSON de un día, ya sea desde su directorio o desde el archivo mensual.
+# :return: Diccionario {nombre de fichero: contenido}, vacío si el día no existe.
+def leer_dia(dia, raiz="Archivos-JSON"):
+    datos = {}
+    carpeta = os.path.join(raiz, dia)
+    if os.path.isdir(carpeta):
+        for archivo in sorted(os.listdir(carpeta)):
+            if archivo.endswith(".json"):
+                with open(os.path.join(carpeta, archivo), "r", encoding="utf-8") as f:
+                    datos[archivo] = json.load(f)
+        return datos
+
+    destino = ruta_archivo(raiz, dia)
+    if not os.path.exists(destino):
+        return datos
+
+    import zipfile
+
+    with zipfile.ZipFile(destino) as zf:
+        for nombre in zf.namelist():
+            if nombre.startswith(f"{dia}/") and nombre.endswith(".json"):
+                with zf.open(nombre) as f:
+                    datos[nombre[len(dia) + 1 :]] = json.load(f)
+    return datos
+
+
+def main():
+    print("=== Compactación y Retención de Instantáneas ===")
+    aplicar_retencion()
+
+
+if __name__ == "__main__":
+    main()
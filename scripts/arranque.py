@@ -0,0 +1,110 @@
+import os
+import subprocess
+import sys
+import time
+
+from scripts.plataforma import SISTEMA
+
+# Presupuesto de importación en microsegundos (medido con 'python -X importtime')
+# para el coordinador y para cada recolector cargado con --only. Los valores son
+# unas 1,4 veces lo medido (12, 17,5, 33 y 15,5 ms), lo justo para absorber la
+# variación entre ejecuciones sin dejar pasar una importación pesada.
+PRESUPUESTO_US = {
+    "coordinador": 17000,
+    "scripts.OS_HW": 25000,
+    "scripts.red": 46000,
+    "scripts.aplicaciones": 22000,
+}
+
+# Módulos pesados que solo se importan dentro de las funciones que los usan y
+# nunca deben cargarse al arrancar
+DIFERIDOS = ["asyncio", "platform", "zipfile", "shutil"]
+
+# Módulos de otros sistemas operativos que no deben cargarse en el actual
+BACKENDS = {
+    "Windows": ["scripts.sondas_windows", "winreg"],
+    "Darwin": ["scripts.sondas_macos"],
+    "Linux": ["scripts.sondas_linux"],
+}
+
+REPETICIONES = 8
+
+# Segundos de espera entre medidas que exceden el presupuesto
+PAUSA = 0.1
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Importa los módulos indicados en un intérprete nuevo con -X importtime.
+# :return: Tupla (microsegundos acumulados de los módulos del proyecto,
+#          conjunto de módulos cargados).
+def medir_importacion(modulos):
+    resultado = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(modulos)}"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        cwd=RAIZ,
+    )
+    total = 0
+    cargados = set()
+    for linea in resultado.stderr.splitlines():
+        if not linea.startswith("import time:") or "|" not in linea:
+            continue
+        _, acumulado, nombre = linea.split("|")
+        if not acumulado.strip().isdigit():
+            continue
+        cargados.add(nombre.strip())
+        # Solo cuentan las importaciones de primer nivel del proyecto; las
+        # anidadas ya están incluidas en su tiempo acumulado
+        if not nombre.startswith("  ") and nombre.strip().split(".")[0] in (
+            "coordinador",
+            "scripts",
+        ):
+            total += int(acumulado)
+    return total, cargados
+
+
+# Comprueba que el coordinador y cada recolector se importan dentro de su
+# presupuesto y que no se cargan los backends de otros sistemas operativos ni
+# los módulos diferidos.
+# :return: True si se cumplen todos los límites.
+def verificar_presupuesto():
+    prohibidos = [
+        modulo
+        for sistema, modulos in BACKENDS.items()
+        if sistema != SISTEMA
+        for modulo in modulos
+    ]
+    correcto = True
+
+    for modulo, presupuesto in PRESUPUESTO_US.items():
+        modulos = (
+            ["coordinador"] if modulo == "coordinador" else ["coordinador", modulo]
+        )
+        # Se toma la mejor de varias medidas espaciadas y se para en cuanto una
+        # cumple el presupuesto: los picos de carga de la máquina no cuentan
+        # como regresión
+        tiempo = None
+        for _ in range(REPETICIONES):
+            total, cargados = medir_importacion(modulos)
+            tiempo = total if tiempo is None else min(tiempo, total)
+            if tiempo <= presupuesto:
+                break
+            time.sleep(PAUSA)
+
+        estado = "OK" if tiempo <= presupuesto else "EXCEDIDO"
+        print(f"{modulo}: {tiempo} us (presupuesto {presupuesto} us) {estado}")
+        correcto = correcto and tiempo <= presupuesto
+
+        indebidos = sorted(cargados.intersection(prohibidos))
+        if indebidos:
+            print(f"  Módulos de otros sistemas cargados: {', '.join(indebidos)}")
+            correcto = False
+
+        anticipados = sorted(cargados.intersection(DIFERIDOS))
+        if anticipados:
+            print(f"  Módulos diferidos cargados al arrancar: {', '.join(anticipados)}")
+            correcto = False
+
+    return correcto
@@ -0,0 +1,297 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+NOMBRE_INSTANTANEA = "informacion_sistema.json"
+NOMBRE_MANIFIESTO = ".manifiesto-flota.json"
+NOMBRE_RESUMEN = "resumen_flota.json"
+
+UNIDADES_GB = {"KB": 1 / 1024**2, "MB": 1 / 1024, "GB": 1, "TB": 1024}
+
+PATRON_DIA = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+# Busca recursivamente los archivos de instantánea dentro de un directorio.
+# :return: Lista ordenada de rutas relativas al directorio.
+def descubrir_instantaneas(directorio, nombre=NOMBRE_INSTANTANEA):
+    encontrados = []
+    for actual, _, archivos in os.walk(directorio):
+        for archivo in archivos:
+            if archivo == nombre:
+                ruta = os.path.join(actual, archivo)
+                encontrados.append(os.path.relpath(ruta, directorio))
+    return sorted(encontrados)
+
+
+# Devuelve el host de una instantánea a partir de su ruta relativa. Por defecto
+# es la primera carpeta que no es una fecha YYYY-MM-DD, de modo que sirven tanto
+# 'hostA/2026-10-19/informacion_sistema.json' como
+# '2026-10-19/hostA/informacion_sistema.json'; sin ninguna, la instantánea es
+# del propio directorio ("."). Con 'nivel' se usa la carpeta de esa profundidad
+# (1 = primera carpeta bajo el directorio compartido).
+def clave_host(ruta, nivel=None):
+    carpetas = ruta.split(os.sep)[:-1]
+    if nivel is not None:
+        return carpetas[nivel - 1] if len(carpetas) >= nivel else "."
+    for carpeta in carpetas:
+        if not PATRON_DIA.fullmatch(carpeta):
+            return carpeta
+    return "."
+
+
+# Orden de antigüedad de una instantánea: la fecha YYYY-MM-DD de su ruta, si la
+# tiene, y después la fecha de modificación del archivo.
+def orden_instantanea(ruta, entrada):
+    fechas = [parte for parte in ruta.split(os.sep) if PATRON_DIA.fullmatch(parte)]
+    return (fechas[-1] if fechas else "", entrada["mtime"])
+
+
+# Calcula el hash SHA-256 de un archivo leyéndolo por bloques.
+def hash_archivo(ruta):
+    sha = hashlib.sha256()
+    with open(ruta, "rb") as archivo:
+        for bloque in iter(lambda: archivo.read(1024 * 1024), b""):
+            sha.update(bloque)
+    return sha.hexdigest()
+
+
+# Convierte una capacidad de RAM ("16 GB", "16384 MB", 15.89) a gigabytes.
+def capacidad_gb(valor):
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    coincidencia = re.match(r"\s*([\d.]+)\s*([KMGT]B)", str(valor))
+    if not coincidencia:
+        return 0.0
+    return float(coincidencia.group(1)) * UNIDADES_GB[coincidencia.group(2)]
+
+
+# Extrae de una instantánea consolidada solo los datos que necesitan las tablas
+# de la flota, para no mantener la instantánea completa en memoria.
+def resumir_instantanea(data):
+    os_hw = data.get("os_hw", {})
+
+    cpu = os_hw.get("CPU", {})
+    modelo_cpu = (
+        cpu.get("Model name")
+        or cpu.get("Name")
+        or cpu.get("Modelo de CPU")
+        or "Desconocido"
+    )
+
+    ram_gb = float(
+        sum(
+            capacidad_gb(modulo.get("Capacidad (GB)", 0))
+            for modulo in os_hw.get("RAM", [])
+            if isinstance(modulo, dict)
+        )
+    )
+
+    puertos = set()
+    for host, info in data.get("red-scan", {}).items():
+        if host == "Comando" or not isinstance(info, dict):
+            continue
+        for puerto in info.get("Puertos", []):
+            if puerto.get("Estado") == "open":
+                puertos.add(f"{puerto['Puerto']}/{puerto['Protocolo']}")
+
+    paquetes = {
+        aplicacion["nombre"]: aplicacion.get("version", "Desconocida")
+        for aplicacion in data.get("aplicaciones", {}).get("aplicaciones", [])
+        if aplicacion.get("nombre")
+    }
+
+    return {
+        "CPU": modelo_cpu,
+        "RAM (GB)": round(ram_gb, 2),
+        "Puertos": sorted(puertos),
+        "Paquetes": paquetes,
+    }
+
+
+# Tarea que se ejecuta en los procesos del pool: comprueba el hash de una
+# instantánea y solo la analiza si su contenido cambió.
+# :param tarea: Tupla (directorio, ruta relativa, hash conocido o None).
+# :return: Tupla (ruta relativa, entrada del manifiesto o None si no se pudo leer,
+#          True si la instantánea se analizó de nuevo).
+def procesar_instantanea(tarea):
+    directorio, ruta, hash_conocido = tarea
+    completa = os.path.join(directorio, ruta)
+    try:
+        huella = hash_archivo(completa)
+        estado = os.stat(completa)
+        entrada = {"hash": huella, "mtime": estado.st_mtime, "tamano": estado.st_size}
+        if huella == hash_conocido:
+            return ruta, entrada, False
+        with open(completa, "r", encoding="utf-8") as archivo:
+            entrada["resumen"] = resumir_instantanea(json.load(archivo))
+        return ruta, entrada, True
+    except (OSError, ValueError) as e:
+        print(f"Advertencia: no se pudo leer '{ruta}': {e}")
+        return ruta, None, False
+
+
+# Crea los acumuladores vacíos de las tablas de la flota.
+def nuevo_combinador():
+    return {
+        "Hosts": 0,
+        "Modelos de CPU": Counter(),
+        "RAM total (GB)": 0.0,
+        "RAM por host": Counter(),
+        "Puertos": {},
+        "Paquetes": {},
+    }
+
+
+# Incorpora el resumen de un host a los acumuladores sin guardar el resumen.
+def combinar(acumulado, host, resumen):
+    acumulado["Hosts"] += 1
+    acumulado["Modelos de CPU"][resumen["CPU"]] += 1
+    acumulado["RAM total (GB)"] += resumen["RAM (GB)"]
+    acumulado["RAM por host"][resumen["RAM (GB)"]] += 1
+    for puerto in resumen["Puertos"]:
+        acumulado["Puertos"].setdefault(puerto, []).append(host)
+    for nombre, version in resumen["Paquetes"].items():
+        acumulado["Paquetes"].setdefault(nombre, Counter())[version] += 1
+
+
+# Convierte los acumuladores en las tablas de resumen que se guardan en JSON.
+def tablas_flota(acumulado):
+    return {
+        "Hosts": acumulado["Hosts"],
+        "Modelos de CPU": dict(acumulado["Modelos de CPU"].most_common()),
+        "RAM": {
+            "Total (GB)": round(acumulado["RAM total (GB)"], 2),
+            "Hosts por capacidad (GB)": {
+                str(capacidad): cantidad
+                for capacidad, cantidad in sorted(acumulado["RAM por host"].items())
+            },
+        },
+        "Puertos": {
+            puerto: sorted(hosts)
+            for puerto, hosts in sorted(
+                acumulado["Puertos"].items(), key=lambda item: -len(item[1])
+            )
+        },
+        "Paquetes": {
+            nombre: dict(versiones.most_common())
+            for nombre, versiones in sorted(acumulado["Paquetes"].items())
+        },
+    }
+
+
+# Carga el manifiesto de una ejecución anterior, o uno vacío si no existe.
+def cargar_manifiesto(ruta):
+    if not os.path.exists(ruta):
+        return {}
+    try:
+        with open(ruta, "r", encoding="utf-8") as archivo:
+            return json.load(archivo)
+    except ValueError:
+        print(f"Advertencia: manifiesto '{ruta}' dañado, se reconstruirá.")
+        return {}
+
+
+# Agrega todas las instantáneas de un directorio en tablas de flota, tomando
+# para cada host (ver clave_host) su instantánea más reciente.
+# Solo se vuelven a leer las instantáneas nuevas o cuyo contenido cambió; el
+# resto reutiliza el resumen guardado en el manifiesto.
+# :param directorio: Carpeta compartida con las instantáneas de los hosts.
+# :param procesos: Número de procesos del pool (por defecto, uno por CPU).
+# :param nivel_host: Profundidad de la carpeta que identifica al host (por
+#                    defecto, la primera que no es una fecha).
+# :return: Diccionario con las tablas de la flota.
+def agregar_flota(directorio, procesos=None, nivel_host=None):
+    ruta_manifiesto = os.path.join(directorio, NOMBRE_MANIFIESTO)
+    anterior = cargar_manifiesto(ruta_manifiesto)
+    manifiesto = {}
+    tareas = []
+
+    for ruta in descubrir_instantaneas(directorio):
+        conocida = anterior.get(ruta)
+        estado = os.stat(os.path.join(directorio, ruta))
+        # Si el tamaño y la fecha no cambiaron ni siquiera se recalcula el hash
+        if (
+            conocida
+            and conocida["mtime"] == estado.st_mtime
+            and conocida["tamano"] == estado.st_size
+        ):
+            manifiesto[ruta] = conocida
+        else:
+            tareas.append((directorio, ruta, conocida["hash"] if conocida else None))
+
+    leidas = 0
+    if tareas:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            for ruta, entrada, cambiada in pool.map(
+                procesar_instantanea, tareas, chunksize=16
+            ):
+                if entrada is None:
+                    continue
+                if not cambiada:
+                    entrada["resumen"] = anterior[ruta]["resumen"]
+                leidas += cambiada
+                manifiesto[ruta] = entrada
+
+    print(
+        f"Instantáneas: {len(manifiesto)}, leídas de nuevo: {leidas}, "
+        f"reutilizadas: {len(manifiesto) - leidas}"
+    )
+
+    # Un host puede guardar una instantánea por día: solo cuenta la más reciente
+    recientes = {}
+    for ruta, entrada in manifiesto.items():
+        host = clave_host(ruta, nivel_host)
+        actual = recientes.get(host)
+        if actual is None or orden_instantanea(ruta, entrada) > orden_instantanea(
+            *actual
+        ):
+            recientes[host] = (ruta, entrada)
+
+    acumulado = nuevo_combinador()
+    for host, (_, entrada) in sorted(recientes.items()):
+        combinar(acumulado, host, entrada["resumen"])
+
+    with open(ruta_manifiesto, "w", encoding="utf-8") as archivo:
+        json.dump(manifiesto, archivo, ensure_ascii=False)
+
+    return tablas_flota(acumulado)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Agrega las instantáneas de varios hosts en tablas de flota.",
+        epilog=(
+            "Cada host debe tener su propia carpeta bajo el directorio, antes o "
+            "después de la carpeta de fecha: <host>/<fecha>/informacion_sistema.json "
+            "o <fecha>/<host>/informacion_sistema.json. Por defecto el host es la "
+            "primera carpeta que no es una fecha YYYY-MM-DD; usa --nivel-host para "
+            "otras estructuras. De cada host solo se cuenta la instantánea más "
+            "reciente."
+        ),
+    )
+    parser.add_argument("directorio", help="Carpeta con las instantáneas recolectadas")
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument(
+        "--nivel-host",
+        type=int,
+        default=None,
+        help="Profundidad de la carpeta que identifica al host (1 = primera)",
+    )
+    parser.add_argument("--salida", default=None)
+    args = parser.parse_args()
+
+    print("=== Agregación de la Flota ===")
+    tablas = agregar_flota(args.directorio, args.procesos, args.nivel_host)
+
+    salida = args.salida or os.path.join(args.directorio, NOMBRE_RESUMEN)
+    with open(salida, "w", encoding="utf-8") as archivo:
+        json.dump(tablas, archivo, indent=4, ensure_ascii=False)
+    print(f"Resumen de {tablas['Hosts']} hosts guardado en '{salida}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+import sys
+
+# Sistema operativo detectado una sola vez al importar, con los mismos valores
+# que platform.system(). Se deduce de sys.platform para no cargar el módulo
+# platform (ni ejecutar uname) en cada arranque.
+if sys.platform == "win32":
+    SISTEMA = "Windows"
+elif sys.platform == "darwin":
+    SISTEMA = "Darwin"
+elif sys.platform.startswith("linux"):
+    SISTEMA = "Linux"
+else:
+    import platform
+
+    SISTEMA = platform.system()
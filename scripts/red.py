@@ -1,14 +1,60 @@
-import platform
 import json
 import os
 import subprocess
 import re
+import hashlib
+import ipaddress
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from scripts.plataforma import SISTEMA
+
+# Caché de huellas de servicios detectados con 'nmap -sV'
+FINGERPRINT_CACHE = "Archivos-JSON/cache-servicios.json"
+
+# Segundos tras los cuales un servicio en caché se vuelve a sondear con -sV
+FINGERPRINT_TTL = 7 * 24 * 3600
+
+# Tiempo máximo de espera al leer el banner de un puerto
+BANNER_TIMEOUT = 0.5
+
+# Partes de un banner que cambian en cada conexión: números sueltos (horas,
+# fechas, identificadores de sesión) y nombres de día y mes. Las versiones con
+# puntos (8.0.35) se conservan para detectar actualizaciones del servicio
+BANNER_VOLATILE = re.compile(
+    r"(\d+(?:\.\d+)+)|\d+"
+    r"|\b(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct"
+    r"|Nov|Dec)\b"
+)
+
+# Caché del estado de los hosts descubiertos antes del escaneo de puertos
+HOST_CACHE = "Archivos-JSON/cache-hosts.json"
+
+# Segundos durante los que se confía en el estado de un host en caché
+HOST_TTL = 300
+
+# Tabla ARP/vecinos del kernel usada para sembrar los hosts activos
+ARP_TABLE = "/proc/net/arp"
+
+# Puertos habituales usados como "ping" TCP en el descubrimiento de hosts
+DISCOVERY_PORTS = [22, 80, 443, 445, 3389]
+
+# Tiempo máximo de espera de cada conexión del ping TCP
+DISCOVERY_TIMEOUT = 1.0
+
+# Conexiones simultáneas máximas durante el descubrimiento
+DISCOVERY_CONCURRENCY = 256
+
+# Direcciones máximas que se expanden para el descubrimiento (una red /20); los
+# objetivos que superan el límite se pasan a Nmap sin expandir
+MAX_DISCOVERY_HOSTS = 4096
+
 
 # Verifica si un comando está disponible en el sistema.
 def command_exists(command):
-    if platform.system() == "Windows":
+    if SISTEMA == "Windows":
         # En Windows, utilizamos 'where' para verificar la existencia del comando
         result = subprocess.run(
             f"where {command}",
@@ -27,11 +73,278 @@ def command_exists(command):
     return result.returncode == 0
 
 
+# Analiza la salida de Nmap y devuelve los hosts con sus puertos.
+# :param output: Texto devuelto por Nmap.
+# :return: Diccionario {host: {"Estado": ..., "Puertos": [...]}}.
+def parse_nmap_output(output):
+    scan_results = {}
+    current_host = None
+    for line in output.splitlines():
+        # Detecta un host
+        if line.startswith("Nmap scan report for"):
+            current_host = line.split()[-1]
+            scan_results[current_host] = {"Estado": "Indeterminado", "Puertos": []}
+        # Detecta el estado del host
+        elif line.startswith("Host is up"):
+            if current_host:
+                scan_results[current_host]["Estado"] = "Activo"
+        # Detecta los puertos y servicios
+        elif re.match(r"\d+/tcp", line) or re.match(r"\d+/udp", line):
+            if current_host:
+                port_data = line.split()
+                port_info = {
+                    "Puerto": port_data[0].split("/")[0],
+                    "Protocolo": port_data[0].split("/")[1],
+                    "Estado": port_data[1],
+                    "Servicio": port_data[2],
+                    "Versión": (
+                        " ".join(port_data[3:]) if len(port_data) > 3 else "Desconocida"
+                    ),
+                }
+                scan_results[current_host]["Puertos"].append(port_info)
+    return scan_results
+
+
+# Carga una caché JSON (huellas de servicios o hosts activos), o una vacía si no existe.
+def load_cache(path):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as cache_file:
+            return json.load(cache_file)
+    except ValueError:
+        return {}
+
+
+# Guarda una caché JSON.
+def save_cache(cache, path):
+    folder = os.path.dirname(path)
+    if folder and not os.path.exists(folder):
+        os.makedirs(folder)
+    with open(path, "w", encoding="utf-8") as cache_file:
+        json.dump(cache, cache_file, ensure_ascii=False, indent=4)
+
+
+# Reduce un banner a la parte que identifica al servicio: el primer tramo de
+# texto imprimible (la primera línea, o la versión en saludos binarios como el
+# de MySQL, que después lleva una sal aleatoria) sin las partes volátiles.
+def normalize_banner(banner):
+    text = re.search(r"[\x20-\x7e]{3,}", banner.decode("latin-1"))
+    if not text:
+        return ""
+    return BANNER_VOLATILE.sub(lambda match: match.group(1) or "", text.group(0))
+
+
+# Calcula una huella barata de un puerto TCP: el hash del banner normalizado que
+# envía el servicio al conectarse (vacío si no envía nada antes del tiempo límite).
+# :return: Hash SHA-256 del banner, o None si el puerto no acepta la conexión.
+def banner_hash(host, port, timeout=BANNER_TIMEOUT):
+    try:
+        with socket.create_connection((host, int(port)), timeout=timeout) as connection:
+            try:
+                banner = connection.recv(1024)
+            except socket.timeout:
+                banner = b""
+    except OSError:
+        return None
+    return hashlib.sha256(normalize_banner(banner).encode("utf-8")).hexdigest()
+
+
+# Clave de la caché para un puerto de un host.
+def fingerprint_key(host, port_info):
+    return f"{host.strip('()')}/{port_info['Puerto']}/{port_info['Protocolo']}"
+
+
+# Expande los objetivos de Nmap en direcciones individuales. Solo se expanden
+# direcciones IP, redes CIDR (192.168.1.0/24) y rangos válidos en el último octeto
+# (192.168.1.10-20); el resto de la sintaxis de Nmap (nombres de host, comodines
+# como 10.0.0.*, rangos en otros octetos, listas con comas) y los objetivos que
+# superarían el límite de direcciones se devuelven sin cambios para que Nmap los
+# interprete y haga su propio descubrimiento.
+# :param targets: Objetivos de Nmap separados por espacios.
+# :param limit: Número máximo de direcciones expandidas en total.
+# :return: Tupla (direcciones expandidas, objetivos que se pasan tal cual a Nmap).
+def expand_targets(targets, limit=MAX_DISCOVERY_HOSTS):
+    hosts = []
+    passthrough = []
+    for target in targets.split():
+        match = re.fullmatch(r"(\d+\.\d+\.\d+\.)(\d+)-(\d+)", target)
+        if match:
+            prefix, start, end = match.groups()
+            try:
+                first = ipaddress.IPv4Address(f"{prefix}{start}")
+                last = ipaddress.IPv4Address(f"{prefix}{end}")
+            except ValueError:
+                passthrough.append(target)
+                continue
+            if first > last:
+                passthrough.append(target)
+                continue
+            size = int(last) - int(first) + 1
+            addresses = (str(first + offset) for offset in range(size))
+        else:
+            try:
+                network = ipaddress.ip_network(target, strict=False)
+            except ValueError:
+                passthrough.append(target)
+                continue
+            # Se comprueba el tamaño antes de recorrer la red: una /8 o un
+            # prefijo IPv6 nunca llegan a generarse
+            size = network.num_addresses
+            if size == 1:
+                addresses = [str(network.network_address)]
+            else:
+                addresses = (str(address) for address in network.hosts())
+
+        if len(hosts) + size > limit:
+            passthrough.append(target)
+            continue
+        hosts += addresses
+    return hosts, passthrough
+
+
+# Lee la tabla ARP/vecinos del kernel (/proc/net/arp) y devuelve las direcciones
+# con una entrada completa, que se consideran activas sin necesidad de sondearlas.
+def arp_neighbors(path=ARP_TABLE):
+    neighbors = set()
+    if not os.path.exists(path):
+        return neighbors
+    with open(path, "r", encoding="utf-8") as arp_file:
+        next(arp_file, None)  # Cabecera
+        for line in arp_file:
+            fields = line.split()
+            # Flags 0x2 = entrada completa; 0x0 = resolución fallida
+            if len(fields) >= 4 and int(fields[2], 16) & 0x2:
+                if fields[3] != "00:00:00:00:00:00":
+                    neighbors.add(fields[0])
+    return neighbors
+
+
+# Ping TCP a un puerto: tanto una conexión aceptada como una rechazada (RST)
+# demuestran que el host está activo; solo el tiempo agotado indica lo contrario.
+async def tcp_ping(host, port, timeout=DISCOVERY_TIMEOUT):
+    import asyncio
+
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except ConnectionRefusedError:
+        return True
+    except (OSError, asyncio.TimeoutError):
+        return False
+    writer.close()
+    return True
+
+
+# Barrido concurrente de ping TCP sobre varios hosts. Un número fijo de
+# trabajadores toma los hosts de una cola acotada, de modo que solo existen
+# DISCOVERY_CONCURRENCY conexiones y corrutinas a la vez; cada trabajador prueba
+# los puertos de un host en orden y se detiene en el primero que responde.
+# :return: Conjunto de hosts que respondieron en alguno de los puertos.
+async def tcp_sweep(hosts, ports, timeout=DISCOVERY_TIMEOUT):
+    import asyncio
+
+    queue = asyncio.Queue(maxsize=DISCOVERY_CONCURRENCY)
+    alive = set()
+
+    async def worker():
+        while True:
+            host = await queue.get()
+            try:
+                for port in ports:
+                    if await tcp_ping(host, port, timeout):
+                        alive.add(host)
+                        break
+            finally:
+                queue.task_done()
+
+    workers = [
+        asyncio.create_task(worker())
+        for _ in range(min(DISCOVERY_CONCURRENCY, len(hosts)))
+    ]
+    for host in hosts:
+        await queue.put(host)
+    await queue.join()
+
+    for task in workers:
+        task.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+    return alive
+
+
+# Descubre los hosts activos entre los objetivos antes del escaneo de puertos.
+# Los hosts con estado en caché más reciente que el TTL no se vuelven a sondear;
+# los presentes en la tabla ARP se dan por activos y el resto se sondea con un
+# barrido de ping TCP.
+# :param hosts: Lista de direcciones o nombres de host.
+# :param ports: Puertos usados para el ping TCP.
+# :param ttl: Segundos de validez del estado de un host en caché.
+# :param cache_path: Ruta de la caché de hosts.
+# :param arp_path: Ruta de la tabla ARP del kernel.
+# :param timeout: Tiempo máximo de espera de cada conexión del ping TCP.
+# :return: Lista de hosts activos, en el orden de entrada.
+def discover_hosts(
+    hosts,
+    ports=DISCOVERY_PORTS,
+    ttl=HOST_TTL,
+    cache_path=HOST_CACHE,
+    arp_path=ARP_TABLE,
+    timeout=DISCOVERY_TIMEOUT,
+):
+    # asyncio tarda más en importarse que el resto del módulo; solo se carga
+    # cuando hay que descubrir hosts para no retrasar el arranque del coordinador
+    import asyncio
+
+    cache = load_cache(cache_path)
+    now = time.time()
+
+    alive = set()
+    unknown = []
+    for host in hosts:
+        entry = cache.get(host)
+        if entry and now - entry["Fecha"] < ttl:
+            if entry["Activo"]:
+                alive.add(host)
+        else:
+            unknown.append(host)
+
+    neighbors = arp_neighbors(arp_path).intersection(unknown)
+    to_probe = [host for host in unknown if host not in neighbors]
+    responded = asyncio.run(tcp_sweep(to_probe, ports, timeout)) if to_probe else set()
+
+    # Los estados caducados se descartan para que la caché no crezca sin límite
+    cache = {host: entry for host, entry in cache.items() if now - entry["Fecha"] < ttl}
+    for host in unknown:
+        active = host in neighbors or host in responded
+        cache[host] = {"Activo": active, "Fecha": now}
+        if active:
+            alive.add(host)
+
+    print(
+        f"Hosts activos: {len(alive)} de {len(hosts)} "
+        f"(caché: {len(hosts) - len(unknown)}, ARP: {len(neighbors)}, "
+        f"ping TCP: {len(responded)})"
+    )
+    save_cache(cache, cache_path)
+    return [host for host in hosts if host in alive]
+
+
 # Ejecuta un escaneo de Nmap sin usar librerías específicas y analiza la salida.
+# Con la caché activada primero se hace un escaneo rápido sin -sV; los puertos
+# abiertos cuyo banner coincide con la caché y no han superado el TTL reutilizan
+# el servicio y la versión guardados, y solo el resto se sondea con -sV.
+# El descubrimiento previo solo usa ping TCP y la tabla ARP, y los hosts activos se
+# escanean con -Pn: un host que solo responde a ICMP o al sondeo ACK al puerto 80
+# del descubrimiento de Nmap se omite. En ese caso se puede usar discover=False
+# para que Nmap haga su propio descubrimiento sobre todos los objetivos.
 # :param targets: Dirección IP o rango de hosts a escanear.
 # :param ports: Rango de puertos a escanear.
+# :param use_cache: Si es False se sondean siempre todos los puertos con -sV.
+# :param ttl: Segundos de validez de una huella en caché.
+# :param discover: Si es True se descubren antes los hosts activos.
 # :return: Diccionario con resultados del escaneo.
-def execute_nmap_scan(targets, ports):
+def execute_nmap_scan(
+    targets, ports, use_cache=True, ttl=FINGERPRINT_TTL, discover=True
+):
     scan_results = {}
 
     # Verifica si Nmap está disponible
@@ -39,43 +352,47 @@ def execute_nmap_scan(targets, ports):
         print("Nmap no está instalado o no está disponible en el PATH del sistema.")
         return {}
 
-    # Construye el comando Nmap
-    command = f"nmap -p {ports} -sV {targets}"
+    # Lista de escaneos (opciones, objetivos). Los hosts activos descubiertos
+    # pasan al escaneo de puertos sin que Nmap repita su descubrimiento (-Pn);
+    # los objetivos que no se pueden expandir se escanean aparte, con el
+    # descubrimiento propio de Nmap
+    scans = [("", targets)]
+    if discover:
+        hosts, passthrough = expand_targets(targets)
+        scans = []
+        if hosts:
+            live_hosts = discover_hosts(hosts)
+            if live_hosts:
+                scans.append(("-Pn ", " ".join(live_hosts)))
+        if passthrough:
+            print(
+                "Objetivos que se pasan a Nmap sin descubrimiento previo: "
+                f"{' '.join(passthrough)}"
+            )
+            scans.append(("", " ".join(passthrough)))
+        if not scans:
+            print("No se encontraron hosts activos entre los objetivos.")
+            return {}
+
     try:
-        # Ejecuta el comando y captura la salida
-        print(f"Ejecutando: {command}")
-        output = subprocess.getoutput(command)
-
-        # Procesa la salida de Nmap
-        current_host = None
-        for line in output.splitlines():
-            # Detecta un host
-            if line.startswith("Nmap scan report for"):
-                current_host = line.split()[-1]
-                scan_results[current_host] = {"Estado": "Indeterminado", "Puertos": []}
-            # Detecta el estado del host
-            elif line.startswith("Host is up"):
-                if current_host:
-                    scan_results[current_host]["Estado"] = "Activo"
-            # Detecta los puertos y servicios
-            elif re.match(r"\d+/tcp", line) or re.match(r"\d+/udp", line):
-                if current_host:
-                    port_data = line.split()
-                    port_info = {
-                        "Puerto": port_data[0].split("/")[0],
-                        "Protocolo": port_data[0].split("/")[1],
-                        "Estado": port_data[1],
-                        "Servicio": port_data[2],
-                        "Versión": (
-                            " ".join(port_data[3:])
-                            if len(port_data) > 3
-                            else "Desconocida"
-                        ),
-                    }
-                    scan_results[current_host]["Puertos"].append(port_info)
+        commands = []
+        for options, scan_targets in scans:
+            # Construye el comando Nmap
+            command = (
+                f"nmap {options}-p {ports} {scan_targets}"
+                if use_cache
+                else f"nmap {options}-p {ports} -sV {scan_targets}"
+            )
+            # Ejecuta el comando y captura la salida
+            print(f"Ejecutando: {command}")
+            scan_results.update(parse_nmap_output(subprocess.getoutput(command)))
+            commands.append(command)
+
+        if use_cache:
+            commands += probe_services(scan_results, ttl)
 
         # Añadir el comando de escaneo a los resultados
-        scan_results["Comando"] = command
+        scan_results["Comando"] = "; ".join(commands)
 
     except RuntimeError as e:
         print(
@@ -87,6 +404,83 @@ def execute_nmap_scan(targets, ports):
     return scan_results
 
 
+# Completa el servicio y la versión de los puertos abiertos usando la caché de
+# huellas y ejecuta 'nmap -sV' solo sobre los puertos nuevos o cambiados.
+# :param scan_results: Resultados del escaneo rápido; se actualizan en el sitio.
+# :param ttl: Segundos de validez de una huella en caché.
+# :return: Lista de comandos -sV ejecutados.
+def probe_services(scan_results, ttl=FINGERPRINT_TTL):
+    cache = load_cache(FINGERPRINT_CACHE)
+    now = time.time()
+
+    open_ports = [
+        (host, port_info)
+        for host, info in scan_results.items()
+        for port_info in info["Puertos"]
+        if port_info["Estado"] == "open"
+    ]
+
+    # Las huellas se calculan en paralelo: un servicio silencioso ocupa el tiempo límite
+    def fingerprint(item):
+        host, port_info = item
+        if port_info["Protocolo"] != "tcp":
+            return ""
+        return banner_hash(host.strip("()"), port_info["Puerto"])
+
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        banners = list(pool.map(fingerprint, open_ports))
+
+    pending = {}
+    reused = 0
+    for (host, port_info), banner in zip(open_ports, banners):
+        entry = cache.get(fingerprint_key(host, port_info))
+        if (
+            entry
+            and banner is not None
+            and entry["Banner"] == banner
+            and now - entry["Fecha"] < ttl
+        ):
+            port_info["Servicio"] = entry["Servicio"]
+            port_info["Versión"] = entry["Versión"]
+            reused += 1
+        else:
+            pending.setdefault(host, []).append((port_info, banner))
+
+    print(
+        f"Servicios reutilizados de la caché: {reused}, por sondear: {len(open_ports) - reused}"
+    )
+
+    commands = []
+    for host, host_ports in pending.items():
+        port_list = ",".join(port_info["Puerto"] for port_info, _ in host_ports)
+        command = f"nmap -Pn -p {port_list} -sV {host.strip('()')}"
+        print(f"Ejecutando: {command}")
+        commands.append(command)
+        detected = {}
+        for info in parse_nmap_output(subprocess.getoutput(command)).values():
+            for port_info in info["Puertos"]:
+                detected[(port_info["Puerto"], port_info["Protocolo"])] = port_info
+
+        for port_info, banner in host_ports:
+            found = detected.get((port_info["Puerto"], port_info["Protocolo"]))
+            if not found:
+                continue
+            port_info["Servicio"] = found["Servicio"]
+            port_info["Versión"] = found["Versión"]
+            cache[fingerprint_key(host, port_info)] = {
+                "Servicio": found["Servicio"],
+                "Versión": found["Versión"],
+                "Banner": banner,
+                "Fecha": now,
+            }
+
+    # Las huellas caducadas (p. ej. de puertos ya cerrados) se descartan para
+    # que la caché no crezca sin límite
+    cache = {key: entry for key, entry in cache.items() if now - entry["Fecha"] < ttl}
+    save_cache(cache, FINGERPRINT_CACHE)
+    return commands
+
+
 # Guarda los resultados del escaneo en un archivo JSON.
 # :param data: Datos a guardar.
 # :param filename: Nombre del archivo JSON.
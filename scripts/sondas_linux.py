@@ -0,0 +1,43 @@
+from scripts.analizador import compilar_sonda
+
+# Sondas declarativas de Linux: cada una describe las etiquetas que interesan de
+# la salida de un comando, la clave con la que se guardan y su conversión.
+
+SONDA_CPU = compilar_sonda(
+    [
+        (None, r"Model name|CPU\(s\)|[^:\r\n]*Thread[^:\r\n]*|[^:\r\n]*MHz", None),
+    ]
+)
+
+SONDA_GPU = compilar_sonda(
+    [
+        ("Nombre", r"[0-9A-Fa-f:.]+ VGA compatible controller", None),
+    ]
+)
+
+SONDA_PLACA = compilar_sonda(
+    [
+        (None, r"Manufacturer|Product Name|Version|Serial Number", None),
+    ]
+)
+
+# dmidecode abre cada estructura con una línea "Handle 0x...", que delimita los módulos
+SONDA_RAM = compilar_sonda(
+    [
+        ("Capacidad (GB)", r"Size", None),
+        ("Velocidad (MHz)", r"Speed", None),
+        ("Fabricante", r"Manufacturer", None),
+    ],
+    inicio=r"Handle 0x[0-9A-Fa-f]+,[^\r\n]*",
+)
+
+SONDA_ALMACENAMIENTO = compilar_sonda(
+    [
+        ("Nombre", r"NAME", None),
+        ("Capacidad", r"SIZE", None),
+        ("Tipo", r"TYPE", None),
+        ("Modelo", r"MODEL", None),
+    ],
+    separador="=",
+    formato="pares",
+)
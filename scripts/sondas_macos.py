@@ -0,0 +1,30 @@
+from scripts.analizador import antes_de_parentesis, compilar_sonda
+
+# Sondas declarativas de macOS: cada una describe las etiquetas que interesan de
+# la salida de un comando, la clave con la que se guardan y su conversión.
+
+SONDA_GPU = compilar_sonda(
+    [
+        ("Nombre", r"Chipset Model", None),
+        ("Memoria Dedicada (MB)", r"VRAM \(Total\)|VRAM \(Dynamic, Max\)", None),
+    ]
+)
+
+SONDA_RAM = compilar_sonda(
+    [
+        ("Capacidad (GB)", r"Size", None),
+        ("Velocidad (MHz)", r"Speed", None),
+        ("Fabricante", r"Manufacturer", None),
+    ]
+)
+
+# diskutil separa cada disco o volumen con una línea de asteriscos
+SONDA_ALMACENAMIENTO = compilar_sonda(
+    [
+        ("Nombre", r"Device Identifier", None),
+        ("Capacidad", r"Total Size", antes_de_parentesis),
+        ("Modelo", r"Device / Media Name", None),
+        ("Tipo", r"File System Personality", None),
+    ],
+    inicio=r"\*+",
+)
@@ -0,0 +1,46 @@
+from scripts.analizador import bytes_a, compilar_sonda
+
+# Sondas declarativas de Windows (wmic /format:list): cada una describe las
+# etiquetas que interesan, la clave con la que se guardan y su conversión.
+
+SONDA_CPU = compilar_sonda(
+    [
+        (None, r"Name|NumberOfCores|NumberOfLogicalProcessors|MaxClockSpeed", None),
+    ],
+    separador="=",
+)
+
+SONDA_GPU = compilar_sonda(
+    [
+        ("Memoria Dedicada (MB)", r"AdapterRAM", bytes_a("MB")),
+        ("Versión del Controlador", r"DriverVersion", None),
+        ("Nombre", r"Name", None),
+    ],
+    separador="=",
+)
+
+SONDA_PLACA = compilar_sonda(
+    [
+        (None, r"Manufacturer|Product|SerialNumber|Version", None),
+    ],
+    separador="=",
+)
+
+SONDA_RAM = compilar_sonda(
+    [
+        ("Capacidad (GB)", r"Capacity", bytes_a("GB")),
+        ("Fabricante", r"Manufacturer", None),
+        ("Velocidad (MHz)", r"Speed", None),
+    ],
+    separador="=",
+)
+
+SONDA_ALMACENAMIENTO = compilar_sonda(
+    [
+        ("Nombre", r"Caption", None),
+        ("Versión Firmware", r"FirmwareRevision", None),
+        ("Tipo", r"MediaType", None),
+        ("Capacidad (GB)", r"Size", bytes_a("GB")),
+    ],
+    separador="=",
+)
@@ -0,0 +1,9 @@
+from scripts.arranque import verificar_presupuesto
+
+
+# El coordinador y cada recolector deben importarse dentro de su presupuesto de
+# 'python -X importtime', sin cargar backends de otros sistemas operativos ni
+# módulos diferidos (asyncio, platform...).
+def test_presupuesto_de_importacion(capsys):
+    correcto = verificar_presupuesto()
+    assert correcto, capsys.readouterr().out
@@ -0,0 +1,94 @@
+import socket
+import sys
+
+import pytest
+
+from scripts import red
+
+solo_linux = pytest.mark.skipif(
+    not sys.platform.startswith("linux"),
+    reason="Usa direcciones 127.0.0.x distintas de 127.0.0.1",
+)
+
+# Dirección de multidifusión: una conexión TCP falla al instante con
+# "Network is unreachable", sin esperar al tiempo límite
+INALCANZABLE = "224.0.0.1"
+
+
+@pytest.fixture
+def escucha():
+    servidor = socket.socket()
+    servidor.bind(("127.0.0.1", 0))
+    servidor.listen()
+    yield servidor.getsockname()[1]
+    servidor.close()
+
+
+# Tabla ARP vacía para que el resultado no dependa de los vecinos del host
+@pytest.fixture
+def arp_vacia(tmp_path):
+    ruta = tmp_path / "arp"
+    ruta.write_text("IP address       HW type     Flags       HW address\n")
+    return str(ruta)
+
+
+@solo_linux
+def test_descubrimiento_en_loopback(tmp_path, escucha, arp_vacia):
+    hosts = ["127.0.0.1", "127.0.0.2", INALCANZABLE]
+    activos = red.discover_hosts(
+        hosts,
+        ports=[escucha],
+        cache_path=str(tmp_path / "cache-hosts.json"),
+        arp_path=arp_vacia,
+        timeout=0.5,
+    )
+    # 127.0.0.1 acepta la conexión y 127.0.0.2 la rechaza: ambos están activos
+    assert activos == ["127.0.0.1", "127.0.0.2"]
+
+
+@solo_linux
+def test_segunda_llamada_usa_la_cache(tmp_path, escucha, arp_vacia, monkeypatch):
+    opciones = {
+        "ports": [escucha],
+        "cache_path": str(tmp_path / "cache-hosts.json"),
+        "arp_path": arp_vacia,
+        "timeout": 0.5,
+    }
+    hosts = ["127.0.0.1", INALCANZABLE]
+    primera = red.discover_hosts(hosts, **opciones)
+
+    async def sin_sondeo(hosts, ports, timeout):
+        raise AssertionError(f"Se sondearon hosts en caché: {hosts}")
+
+    monkeypatch.setattr(red, "tcp_sweep", sin_sondeo)
+    assert red.discover_hosts(hosts, **opciones) == primera == ["127.0.0.1"]
+
+
+def test_tabla_arp_siembra_hosts(tmp_path):
+    arp = tmp_path / "arp"
+    arp.write_text(
+        "IP address       HW type     Flags       HW address            Mask     Device\n"
+        f"{INALCANZABLE}        0x1         0x2         02:fc:00:00:00:05     *        eth0\n"
+    )
+    activos = red.discover_hosts(
+        [INALCANZABLE],
+        cache_path=str(tmp_path / "cache-hosts.json"),
+        arp_path=str(arp),
+    )
+    assert activos == [INALCANZABLE]
+
+
+def test_objetivos_sin_expandir_pasan_a_nmap():
+    hosts, sin_expandir = red.expand_targets(
+        "10.0.0.1 10.0.0.254-255 10.0.0.* 192.168.1-2.1 10.0.0.1,2 "
+        "10.0.0.10-300 10.0.0.0/8 servidor.lan"
+    )
+    assert hosts == ["10.0.0.1", "10.0.0.254", "10.0.0.255"]
+    assert sin_expandir == [
+        "10.0.0.*",
+        "192.168.1-2.1",
+        "10.0.0.1,2",
+        "10.0.0.10-300",
+        "10.0.0.0/8",
+        "servidor.lan",
+    ]